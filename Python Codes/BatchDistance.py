@@ -0,0 +1,295 @@
+#!/usr/bin/env python3
+"""
+BatchDistance.py
+
+Many-vs-one Levenshtein distances. The query is preprocessed once and then
+compared against every candidate, either:
+ - "numpy":        row-by-row DP vectorized over a padded candidate matrix
+                   (best for many short candidates, e.g. dictionary words), or
+ - "bitparallel":  Myers/Hyyrö bit-vector DP per candidate, reusing the
+                   query's character-position bitmasks (best for long strings,
+                   e.g. genomes).
+"""
+
+from typing import Dict, List, Sequence
+import sys
+
+import numpy as np
+
+from Profiling import count, timed
+
+
+# Candidates longer than this are handled by the bit-parallel engine in "auto" mode
+NUMPY_MAX_LEN = 64
+
+
+def encode(s: Sequence) -> np.ndarray:
+    """Encode a string (by code point) or an integer sequence as an int64 array."""
+    if isinstance(s, str):
+        return np.frombuffer(s.encode("utf-32-le"), dtype=np.uint32).astype(np.int64)
+    return np.asarray(s, dtype=np.int64)
+
+
+def _symbolic(s: Sequence) -> bool:
+    """True if s holds symbols that encode() cannot map to integers (e.g. word tokens)."""
+    if isinstance(s, str):
+        return False
+    if isinstance(s, np.ndarray):
+        return s.dtype.kind not in "iub"
+    return any(not isinstance(x, (int, np.integer)) for x in s)
+
+
+def _intern(seqs: Sequence[Sequence], ids: Dict[object, int]) -> List[List[int]]:
+    """Map every symbol of seqs to an integer ID, assigning new IDs from ids."""
+    return [[ids.setdefault(x, len(ids)) for x in s] for s in seqs]
+
+
+def build_peq(query: Sequence) -> Dict[object, int]:
+    """
+    Character-position bitmasks of the query: bit i of peq[c] is set
+    iff query[i] == c.
+    """
+    peq: Dict[object, int] = {}
+    for i, c in enumerate(query):
+        peq[c] = peq.get(c, 0) | (1 << i)
+    return peq
+
+
+def _bit_parallel(peq: Dict[object, int], m: int, text: Sequence) -> int:
+    """
+    Myers' bit-vector edit distance (Hyyrö's global formulation).
+    Column deltas of the DP table are held in Pv/Mv; score tracks the
+    bottom cell D[m][j] while scanning text. Time O(ceil(m/w) * len(text)).
+    """
+    if m == 0:
+        return len(text)
+    mask = (1 << m) - 1
+    top = 1 << (m - 1)
+    pv, mv, score = mask, 0, m
+    for c in text:
+        eq = peq.get(c, 0)
+        xv = eq | mv
+        xh = (((eq & pv) + pv) ^ pv) | eq
+        ph = mv | (~(xh | pv) & mask)
+        mh = pv & xh
+        if ph & top:
+            score += 1
+        elif mh & top:
+            score -= 1
+        # Row 0 of a global alignment grows by one per text character
+        ph = ((ph << 1) | 1) & mask
+        mh = (mh << 1) & mask
+        pv = mh | (~(xv | ph) & mask)
+        mv = ph & xv
+    return score
+
+
+@timed("bitparallel")
+def bit_parallel_distance(a: Sequence, b: Sequence) -> int:
+    """Levenshtein distance of a single pair using the bit-parallel engine."""
+    # Plain ints hash and compare faster than NumPy scalars in the mask lookups
+    if isinstance(a, np.ndarray):
+        a = a.tolist()
+    if isinstance(b, np.ndarray):
+        b = b.tolist()
+    if len(a) < len(b):
+        a, b = b, a  # shorter string becomes the bit-vector
+    count("bitparallel.steps", len(a))
+    return _bit_parallel(build_peq(b), len(b), a)
+
+
+def _advance_rows(prev: np.ndarray, cand: np.ndarray, qc: int, i: int) -> np.ndarray:
+    """
+    One two-row DP step for a whole batch: given row i-1 (prev, shape
+    (N, L+1)) return row i for query character qc against every candidate.
+    Insertions along the row are resolved with a running minimum:
+    cur[j] = min_k<=j (tmp[k] + j - k).
+    """
+    cols = np.arange(prev.shape[1], dtype=prev.dtype)
+    tmp = np.empty_like(prev)
+    tmp[:, 0] = i
+    # substitution/match and deletion
+    np.minimum(prev[:, :-1] + (cand != qc), prev[:, 1:] + 1, out=tmp[:, 1:])
+    tmp -= cols
+    np.minimum.accumulate(tmp, axis=1, out=tmp)
+    tmp += cols
+    return tmp
+
+
+def _pad(batch: Sequence[Sequence], width: int) -> np.ndarray:
+    """
+    Stack a batch of candidates into an (N, width) integer matrix.
+    Padding cells are never read back: D[i][len(c)] only depends on c itself.
+    """
+    if all(isinstance(c, str) for c in batch):
+        # Fixed-width unicode array viewed as code points: no per-string encoding
+        arr = np.array(batch, dtype=f"U{max(width, 1)}")
+        return arr.view(np.uint32).reshape(len(batch), max(width, 1))[:, :width].astype(np.int64)
+    cand = np.full((len(batch), width), -1, dtype=np.int64)
+    for r, c in enumerate(batch):
+        cand[r, :len(c)] = encode(c)
+    return cand
+
+
+def _numpy_batch(q: np.ndarray, batch: Sequence[Sequence]) -> np.ndarray:
+    """Distances from encoded query q to a batch of candidates."""
+    lengths = np.array([len(c) for c in batch], dtype=np.int64)
+    width = int(lengths.max())
+    cand = _pad(batch, width)
+    count("batch.numpy_cells", len(q) * len(batch) * (width + 1))
+    row = np.tile(np.arange(width + 1, dtype=np.int64), (len(batch), 1))
+    for i, qc in enumerate(q, start=1):
+        row = _advance_rows(row, cand, int(qc), i)
+    return row[np.arange(len(batch)), lengths]
+
+
+@timed("batch.distances")
+def distances(query: Sequence, candidates: Sequence[Sequence],
+              method: str = "auto", batch_size: int = 4096) -> np.ndarray:
+    """
+    Levenshtein distance from query to every candidate.
+    The query is preprocessed once; candidates are processed in batches.
+    Returns an int64 array aligned with candidates.
+    """
+    n_cand = len(candidates)
+    out = np.empty(n_cand, dtype=np.int64)
+    count("batch.candidates", n_cand)
+    if n_cand == 0:
+        return out
+
+    if method == "auto":
+        longest = max(len(c) for c in candidates)
+        method = "numpy" if longest <= NUMPY_MAX_LEN else "bitparallel"
+
+    if method == "bitparallel":
+        qseq = query.tolist() if isinstance(query, np.ndarray) else query
+        peq = build_peq(qseq)
+        m = len(qseq)
+        steps = 0
+        for idx, cand in enumerate(candidates):
+            if isinstance(cand, np.ndarray):
+                cand = cand.tolist()
+            out[idx] = _bit_parallel(peq, m, cand)
+            steps += len(cand)
+        count("batch.bitparallel_steps", steps)
+        return out
+
+    if method != "numpy":
+        raise ValueError(f"Unknown method: {method}")
+
+    if _symbolic(query) or any(_symbolic(c) for c in candidates):
+        # Token sequences: intern symbols so the batch works on integer matrices
+        ids: Dict[object, int] = {}
+        query = _intern([query], ids)[0]
+        candidates = _intern(candidates, ids)
+    q = encode(query)
+    # Sort by length so each batch is padded only to its own longest candidate
+    order = sorted(range(n_cand), key=lambda r: len(candidates[r]))
+    for start in range(0, n_cand, batch_size):
+        idx = order[start:start + batch_size]
+        out[idx] = _numpy_batch(q, [candidates[r] for r in idx])
+    return out
+
+
+class IncrementalLevenshtein:
+    """
+    Distances from a growing query to a fixed candidate list, for typeahead.
+    One DP row per query prefix is kept (rows[i] = distances from query[:i]
+    to every candidate prefix), so append() costs one batched two-row step,
+    O(N * L), instead of restarting from an empty table, and pop() is O(1).
+
+    Candidate symbols are re-coded by rank in the candidates' alphabet (one
+    byte each for up to 255 distinct symbols, else two) and rows are stored
+    as saturating uint8 (uint16 once L >= 255), so for N candidates of at
+    most L symbols memory is N * L bytes plus N * (L + 1) bytes per query
+    character (doubled in the wide cases). Distances above 255 (65535) are
+    reported as 255 (65535).
+    """
+
+    def __init__(self, candidates: Sequence[Sequence]):
+        self.candidates = candidates
+        self._lengths = np.array([len(c) for c in candidates], dtype=np.int64)
+        width = int(self._lengths.max()) if len(candidates) else 0
+        # Token IDs of symbolic candidates, or None when symbols are encodable
+        self._ids = None
+        if any(_symbolic(c) for c in candidates):
+            self._ids = {}
+            candidates = _intern(candidates, self._ids)
+        alphabet = sorted({ord(x) if isinstance(x, str) else int(x) for x in set().union(*candidates)})
+        # Rank of each symbol code; len(alphabet) is left free for unseen query symbols
+        self._alphabet: Dict[int, int] = {c: r for r, c in enumerate(alphabet)}
+        code_type = np.uint8 if len(alphabet) < 256 else np.uint16 if len(alphabet) < 65536 else np.int64
+        self._cand = np.empty((len(candidates), width), dtype=code_type)
+        lookup = np.array(alphabet, dtype=np.int64)
+        for start in range(0, len(candidates), 4096):
+            # Encoded in blocks to bound the int64 scratch; padding ranks are never read
+            block = _pad(candidates[start:start + 4096], width)
+            self._cand[start:start + 4096] = np.searchsorted(lookup, block)
+        self._dtype = np.uint8 if width < 255 else np.uint16
+        self._cap = int(np.iinfo(self._dtype).max)
+        first = np.minimum(np.arange(width + 1), self._cap).astype(self._dtype)
+        self._rows = [np.tile(first, (len(candidates), 1))]
+        self.query: List = []
+
+    def append(self, ch) -> None:
+        """Extend the query by one character or token."""
+        if self._ids is not None:
+            code = self._ids.get(ch)
+        else:
+            code = ord(ch) if isinstance(ch, str) else int(ch)
+        qc = self._alphabet.get(code, len(self._alphabet))  # unseen symbols match nothing
+        count("incremental.cells", self._cand.size + len(self.candidates))
+        # Step in a signed type (_advance_rows goes below zero), then saturate;
+        # capping commutes with min and +1, so stored cells are min(D, cap)
+        work = np.int16 if self._dtype == np.uint8 else np.int32
+        row = _advance_rows(self._rows[-1].astype(work), self._cand, qc,
+                            min(len(self._rows), self._cap))
+        np.minimum(row, self._cap, out=row)
+        self._rows.append(row.astype(self._dtype))
+        self.query.append(ch)
+
+    def pop(self):
+        """Remove and return the last query character."""
+        if not self.query:
+            raise IndexError("pop from empty query")
+        self._rows.pop()
+        return self.query.pop()
+
+    def set_query(self, query: Sequence) -> None:
+        """Move to a new query, keeping the rows of the shared prefix."""
+        common = 0
+        for old, new in zip(self.query, query):
+            if old != new:
+                break
+            common += 1
+        while len(self.query) > common:
+            self.pop()
+        for ch in query[common:]:
+            self.append(ch)
+
+    def distances(self) -> np.ndarray:
+        """Distance from the current query to every candidate."""
+        return self._rows[-1][np.arange(len(self.candidates)), self._lengths].astype(np.int64)
+
+
+def main(argv: List[str] = None) -> int:
+    """
+    Main function: distances from one query to the remaining arguments.
+    Takes input manually if no arguments are given.
+    """
+    if argv is None:
+        argv = sys.argv[1:]
+
+    if len(argv) >= 2:
+        query, candidates = argv[0], argv[1:]
+    else:
+        query = input("Enter query string: ").strip()
+        candidates = input("Enter candidate strings (space separated): ").split()
+
+    for cand, dist in zip(candidates, distances(query, candidates)):
+        print(f"{cand}: {dist}")
+    return 0
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,145 @@
+#!/usr/bin/env python3
+"""
+Corpus_Eval.py
+
+Streaming evaluation of the Human vs Google translation corpora
+(Datasets/*-Corpus.csv). Each CSV is read in chunks, every row's normalized
+Levenshtein distance is computed with the bit-parallel engine in a process
+pool (over characters, or over interned word IDs with --level word), per-row
+results are appended to an output CSV as they arrive, and per-language
+aggregates are printed at the end. Memory use is bounded by the
+chunk size and the number of chunks in flight, not by corpus size.
+"""
+
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, Iterator, List, Sequence, Tuple
+import argparse
+import csv
+import glob
+import os
+import sys
+
+import pandas as pd
+
+from BatchDistance import bit_parallel_distance
+from Tokenize import Vocabulary
+
+
+DEFAULT_CORPORA = os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                               "..", "Datasets", "*-Corpus.csv")
+
+
+def language_of(path: str) -> str:
+    """Language name from a corpus file name, e.g. Hindi-Corpus.csv -> Hindi."""
+    return os.path.basename(path).split("-Corpus")[0]
+
+
+def evaluate_chunk(pairs: List[Tuple[Sequence, Sequence]]) -> List[Tuple[int, int, int, float]]:
+    """
+    Worker task: (len(human), len(google), distance, normalized distance)
+    for every pair of strings or token-ID arrays. Normalization divides by
+    the sum of the two lengths.
+    """
+    out = []
+    for a, b in pairs:
+        dist = bit_parallel_distance(a, b)
+        total = len(a) + len(b)
+        out.append((len(a), len(b), dist, dist / total if total else 0.0))
+    return out
+
+
+def read_chunks(path: str, chunksize: int, level: str = "char") -> Iterator[List[Tuple[Sequence, Sequence]]]:
+    """
+    Yield lists of (Human, Google) pairs, chunksize rows at a time.
+    At word level each text is encoded as token IDs with one vocabulary
+    shared by the whole file, so workers only receive small integer arrays.
+    """
+    vocab = Vocabulary() if level == "word" else None
+    for df in pd.read_csv(path, chunksize=chunksize, dtype=str, keep_default_na=False):
+        pairs = zip(df["Human"], df["Google"])
+        if vocab is not None:
+            pairs = ((vocab.encode(a), vocab.encode(b)) for a, b in pairs)
+        yield list(pairs)
+
+
+def evaluate(paths: List[str], out_path: str, workers: int, chunksize: int,
+             level: str = "char") -> Dict[str, Dict[str, float]]:
+    """
+    Evaluate every corpus file, writing one output row per input row.
+    At most 2 * workers chunks are in flight at any time.
+    Returns per-language aggregates.
+    """
+    stats: Dict[str, Dict[str, float]] = {}
+    with open(out_path, "w", newline="", encoding="utf-8") as fh, \
+            ProcessPoolExecutor(max_workers=workers) as pool:
+        writer = csv.writer(fh)
+        writer.writerow(["language", "row", "human_len", "google_len", "distance", "normalized"])
+
+        pending = deque()
+
+        def drain_one() -> None:
+            lang, first_row, future = pending.popleft()
+            agg = stats.setdefault(lang, {"rows": 0, "distance": 0, "normalized": 0.0,
+                                          "min": float("inf"), "max": 0.0})
+            for offset, (la, lb, dist, norm) in enumerate(future.result()):
+                writer.writerow([lang, first_row + offset, la, lb, dist, f"{norm:.6f}"])
+                agg["rows"] += 1
+                agg["distance"] += dist
+                agg["normalized"] += norm
+                agg["min"] = min(agg["min"], norm)
+                agg["max"] = max(agg["max"], norm)
+            fh.flush()
+
+        for path in paths:
+            lang = language_of(path)
+            row = 0
+            for pairs in read_chunks(path, chunksize, level):
+                if len(pending) >= 2 * workers:
+                    drain_one()
+                pending.append((lang, row, pool.submit(evaluate_chunk, pairs)))
+                row += len(pairs)
+        while pending:
+            drain_one()
+    return stats
+
+
+def print_summary(stats: Dict[str, Dict[str, float]]) -> None:
+    """Print per-language aggregates of the normalized distance."""
+    print("\nCorpus Evaluation Summary (normalized Levenshtein distance)")
+    print("===========================================================")
+    print(f"{'Language':<12}{'Rows':>6}{'Mean':>10}{'Min':>10}{'Max':>10}{'Total dist':>12}")
+    for lang, agg in stats.items():
+        mean = agg["normalized"] / agg["rows"] if agg["rows"] else 0.0
+        low = agg["min"] if agg["rows"] else 0.0
+        print(f"{lang:<12}{agg['rows']:>6}{mean:>10.4f}{low:>10.4f}{agg['max']:>10.4f}{agg['distance']:>12}")
+
+
+def build_parser() -> argparse.ArgumentParser:
+    p = argparse.ArgumentParser(prog="Corpus_Eval.py",
+                                description="Human vs Google corpus evaluation.")
+    p.add_argument("corpora", nargs="*",
+                   help="Corpus CSV files with Human/Google columns (default: Datasets/*-Corpus.csv).")
+    p.add_argument("--out", default="corpus_results.csv", help="Per-row results CSV.")
+    p.add_argument("--workers", type=int, default=os.cpu_count() or 1,
+                   help="Number of worker processes.")
+    p.add_argument("--chunksize", type=int, default=8, help="Rows per task.")
+    p.add_argument("--level", choices=["char", "word"], default="char",
+                   help="Compare characters or interned word tokens (lengths are reported in the same unit).")
+    return p
+
+
+def main(argv: List[str] = None) -> int:
+    args = build_parser().parse_args(argv)
+    paths = args.corpora or sorted(glob.glob(DEFAULT_CORPORA))
+    if not paths:
+        print("No corpus files found.", file=sys.stderr)
+        return 2
+    stats = evaluate(paths, args.out, args.workers, args.chunksize, args.level)
+    print_summary(stats)
+    print(f"\nPer-row results written to {args.out}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
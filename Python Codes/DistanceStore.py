@@ -0,0 +1,173 @@
+#!/usr/bin/env python3
+"""
+DistanceStore.py
+
+Persistent condensed (upper-triangle) store of pairwise Levenshtein distances,
+keyed by variant ID and genome hash. Adding a variant computes only its pairs
+against the variants already stored; dense matrices and CSV files are
+produced on demand as views.
+
+On disk, for a store at <path>:
+ - <path>.npy  : int32 distances, memory-mapped. Pair (i, j), i < j, lives at
+                 j * (j - 1) // 2 + i, so variant n appends exactly n entries.
+ - <path>.json : variant IDs, SHA-1 of each genome and genome lengths.
+"""
+
+from typing import Dict, List, Sequence
+import hashlib
+import json
+import os
+import sys
+
+import numpy as np
+import pandas as pd
+
+from BatchDistance import distances
+
+
+def genome_hash(genome: str) -> str:
+    """SHA-1 hex digest identifying a genome sequence."""
+    return hashlib.sha1(genome.encode("utf-8")).hexdigest()
+
+
+def _pair_index(i: int, j: int) -> int:
+    """Offset of pair (i, j), i < j, in the condensed array."""
+    return j * (j - 1) // 2 + i
+
+
+class CondensedDistanceStore:
+    """Upper-triangle distance store backed by a memory-mapped .npy file."""
+
+    def __init__(self, path: str):
+        self.path = path
+        self._npy = path + ".npy"
+        self._meta = path + ".json"
+        self.ids: List[str] = []
+        self.hashes: List[str] = []
+        self.lengths: List[int] = []
+        self._data = None
+        if os.path.exists(self._meta):
+            with open(self._meta, encoding="utf-8") as fh:
+                meta = json.load(fh)
+            self.ids, self.hashes, self.lengths = meta["ids"], meta["hashes"], meta["lengths"]
+        if os.path.exists(self._npy):
+            self._data = np.load(self._npy, mmap_mode="r+")
+        self._position: Dict[str, int] = {v: i for i, v in enumerate(self.ids)}
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    def _reserve(self, size: int) -> None:
+        """Grow the backing file (geometrically) to hold at least size entries."""
+        capacity = 0 if self._data is None else len(self._data)
+        if size <= capacity:
+            return
+        new_capacity = max(size, 2 * capacity, 64)
+        tmp = self._npy + ".tmp"
+        grown = np.lib.format.open_memmap(tmp, mode="w+", dtype=np.int32, shape=(new_capacity,))
+        if self._data is not None:
+            grown[:capacity] = self._data
+        grown.flush()
+        del grown
+        self._data = None
+        os.replace(tmp, self._npy)
+        self._data = np.load(self._npy, mmap_mode="r+")
+
+    def _save_meta(self) -> None:
+        tmp = self._meta + ".tmp"
+        with open(tmp, "w", encoding="utf-8") as fh:
+            json.dump({"ids": self.ids, "hashes": self.hashes, "lengths": self.lengths}, fh)
+        os.replace(tmp, self._meta)
+
+    def update(self, variants: Sequence[str], genomes: Sequence[str]) -> int:
+        """
+        Bring the store up to date with the given variants.
+        Variants already stored are checked against their genome hash; each
+        new variant is compared only with the variants before it.
+        Returns the number of distances computed.
+        """
+        by_id = dict(zip(variants, genomes))
+        missing = [v for v in self.ids if v not in by_id]
+        if missing:
+            raise ValueError(f"Stored variants missing from input: {missing}")
+        for v in self.ids:
+            if genome_hash(by_id[v]) != self.hashes[self._position[v]]:
+                raise ValueError(f"Genome of {v!r} changed; rebuild the store")
+
+        computed = 0
+        for v, genome in zip(variants, genomes):
+            if v in self._position:
+                continue
+            n = len(self.ids)
+            self._reserve(_pair_index(0, n + 1))
+            if n:
+                row = distances(genome, [by_id[u] for u in self.ids])
+                self._data[_pair_index(0, n):_pair_index(0, n + 1)] = row
+                computed += n
+            self._position[v] = n
+            self.ids.append(v)
+            self.hashes.append(genome_hash(genome))
+            self.lengths.append(len(genome))
+
+        if self._data is not None:
+            self._data.flush()
+        self._save_meta()
+        return computed
+
+    def distance(self, a: str, b: str) -> int:
+        """Stored distance between two variants."""
+        i, j = sorted((self._position[a], self._position[b]))
+        return 0 if i == j else int(self._data[_pair_index(i, j)])
+
+    def matrix(self, normalized: bool = True) -> np.ndarray:
+        """
+        Dense symmetric matrix view. Normalized distances divide by the sum of
+        the two genome lengths, as in SARSCOV_dist.py.
+        """
+        n = len(self.ids)
+        M = np.zeros((n, n))
+        for j in range(1, n):
+            M[:j, j] = self._data[_pair_index(0, j):_pair_index(0, j + 1)]
+        M += M.T
+        if normalized:
+            lengths = np.array(self.lengths, dtype=np.float64)
+            total = lengths[:, None] + lengths[None, :]
+            M = np.divide(M, total, out=np.zeros_like(M), where=total > 0)
+        return M
+
+    def to_dataframe(self, normalized: bool = True) -> pd.DataFrame:
+        """Matrix view labelled by variant ID (input for CSV / heatmap export)."""
+        return pd.DataFrame(self.matrix(normalized), index=self.ids, columns=self.ids)
+
+    def to_csv(self, path: str, normalized: bool = True) -> None:
+        self.to_dataframe(normalized).to_csv(path, index=True)
+
+
+def main(argv: List[str] = None) -> int:
+    """
+    Main function: update a store from a CSV with Variant/Genome columns and
+    export the normalized matrix.
+    Usage: DistanceStore.py <dataset.csv> <store path> [<output.csv>]
+    """
+    if argv is None:
+        argv = sys.argv[1:]
+
+    if len(argv) >= 2:
+        dataset, store_path = argv[0], argv[1]
+        out = argv[2] if len(argv) >= 3 else None
+    else:
+        dataset = input("Enter dataset CSV path: ").strip()
+        store_path = input("Enter store path: ").strip()
+        out = input("Enter output CSV path (blank to skip): ").strip() or None
+
+    df = pd.read_csv(dataset)
+    store = CondensedDistanceStore(store_path)
+    computed = store.update(df["Variant"].tolist(), df["Genome"].tolist())
+    print(f"{len(store)} variants stored, {computed} new distances computed.")
+    if out:
+        store.to_csv(out)
+    return 0
+
+
+if __name__ == "__main__":
+    main()
@@ -1,15 +1,23 @@
 #!/usr/bin/env python3
-from typing import List, Dict, Any, Tuple
+from typing import List, Dict, Any, Sequence, Tuple
 import pprint
 import sys
 
-def _nw_score(A: str, B: str) -> List[int]:
+import numpy as np
+
+from Profiling import count, observe, phase, timed
+from WagnerFischer import replay_ops
+
+
+@timed("hirschberg.nw_score")
+def _nw_score(A: Sequence, B: Sequence) -> List[int]:
     """
-    Compute the last row of the Wagner-Fischer DP table for strings A and B.
+    Compute the last row of the Wagner-Fischer DP table for sequences A and B.
     Used in Hirschberg to efficiently find split points.
     Returns a list of distances from prefix of A to prefixes of B.
     """
     n = len(B)
+    count("hirschberg.cells", len(A) * n)
     prev = list(range(n + 1))  # base case: distances to empty A
     for i in range(1, len(A) + 1):
         cur = [i] + [0] * n  # first element: distance from A[:i] to empty B
@@ -22,12 +30,15 @@ def _nw_score(A: str, B: str) -> List[int]:
     return prev
 
 
-def _align_base(A: str, B: str) -> List[Dict[str, Any]]:
+@timed("hirschberg.align_base")
+def _align_base(A: Sequence, B: Sequence) -> List[Dict[str, Any]]:
     """
     Base case alignment using standard Wagner-Fischer DP.
-    Returns a list of edit operations to transform A into B.
+    Returns a list of edit operations to transform A into B (without
+    positions; replay_ops assigns them).
     """
     m, n = len(A), len(B)
+    count("hirschberg.cells", m * n)
     D = [[0] * (n + 1) for _ in range(m + 1)]
     choice = [[""] * (n + 1) for _ in range(m + 1)]
 
@@ -65,16 +76,16 @@ def _align_base(A: str, B: str) -> List[Dict[str, Any]]:
     while i > 0 or j > 0:
         op = choice[i][j]
         if op == "match":
-            rev_ops.append({"op": "match", "pos": i - 1, "char": A[i - 1]})
+            rev_ops.append({"op": "match", "char": A[i - 1]})
             i, j = i - 1, j - 1
         elif op == "substitute":
-            rev_ops.append({"op": "substitute", "pos": i - 1, "from": A[i - 1], "to": B[j - 1]})
+            rev_ops.append({"op": "substitute", "from": A[i - 1], "to": B[j - 1]})
             i, j = i - 1, j - 1
         elif op == "delete":
-            rev_ops.append({"op": "delete", "pos": i - 1, "char": A[i - 1]})
+            rev_ops.append({"op": "delete", "char": A[i - 1]})
             i -= 1
         elif op == "insert":
-            rev_ops.append({"op": "insert", "pos": i, "char": B[j - 1]})
+            rev_ops.append({"op": "insert", "char": B[j - 1]})
             j -= 1
         else:
             break
@@ -82,17 +93,26 @@ def _align_base(A: str, B: str) -> List[Dict[str, Any]]:
     return list(reversed(rev_ops))  # chronological order
 
 
-def hirschberg_with_log(S: str, T: str) -> Tuple[List[Dict[str, Any]], List[str]]:
+@timed("hirschberg")
+def hirschberg_with_log(S: Sequence, T: Sequence) -> Tuple[List[Dict[str, Any]], List[Sequence]]:
     """
     Hirschberg's algorithm to compute edit operations and intermediate transformations
-    with reduced memory. Returns list of applied operations and resulting strings.
+    with reduced memory. S and T may be strings, token lists or integer arrays.
+    Returns list of applied operations and resulting strings (lists for non-string input).
     """
-    def rec(A: str, B: str) -> List[Dict[str, Any]]:
+    # NumPy arrays (e.g. Vocabulary.encode output) become lists so that ops and
+    # transformations hold plain ints
+    if isinstance(S, np.ndarray):
+        S = S.tolist()
+    if isinstance(T, np.ndarray):
+        T = T.tolist()
+    def rec(A: Sequence, B: Sequence, depth: int = 0) -> List[Dict[str, Any]]:
+        observe("hirschberg.depth", depth)
         # Base cases: one string empty or length 1
         if len(A) == 0:
-            return [{"op": "insert", "pos": i, "char": B[i]} for i in range(len(B))]
+            return [{"op": "insert", "char": B[i]} for i in range(len(B))]
         if len(B) == 0:
-            return [{"op": "delete", "pos": 0, "char": A[i]} for i in range(len(A))]
+            return [{"op": "delete", "char": A[i]} for i in range(len(A))]
         if len(A) == 1 or len(B) == 1:
             return _align_base(A, B)
 
@@ -114,54 +134,23 @@ def hirschberg_with_log(S: str, T: str) -> Tuple[List[Dict[str, Any]], List[str]
                 best_k = k
 
         # Recurse on left and right halves
-        left_ops = rec(A[:mid], B[:best_k])
-        right_ops = rec(A[mid:], B[best_k:])
-
-        # Shift right operations by mid for correct positions
-        shifted_right_ops = []
-        for op in right_ops:
-            op_copy = op.copy()
-            if "pos" in op_copy:
-                op_copy["pos"] += mid
-            shifted_right_ops.append(op_copy)
+        left_ops = rec(A[:mid], B[:best_k], depth + 1)
+        right_ops = rec(A[mid:], B[best_k:], depth + 1)
 
-        return left_ops + shifted_right_ops
+        # Positions are assigned when the ops are replayed, so halves just concatenate
+        return left_ops + right_ops
 
     # Get all edit operations
     ops = rec(S, T)
 
-    # Apply operations step-by-step to get intermediate transformations
-    cur = list(S)
-    transformations = ["".join(cur)]
-    applied = []
-
-    for action in ops:
-        typ = action["op"]
-        if typ == "match":
-            applied.append({"op": "match", "pos": action["pos"], "char": action["char"]})
-        elif typ == "substitute":
-            p = action["pos"]
-            if 0 <= p < len(cur):
-                old = cur[p]
-                cur[p] = action["to"]
-                applied.append({"op": "substitute", "pos": p, "from": old, "to": action["to"]})
-        elif typ == "delete":
-            p = action["pos"]
-            if 0 <= p < len(cur):
-                removed = cur.pop(p)
-                applied.append({"op": "delete", "pos": p, "char": removed})
-        elif typ == "insert":
-            p = action["pos"]
-            if p < 0: p = 0
-            if p > len(cur): p = len(cur)
-            cur.insert(p, action["char"])
-            applied.append({"op": "insert", "pos": p, "char": action["char"]})
-        transformations.append("".join(cur))
+    with phase("hirschberg.replay"):
+        # Apply operations step-by-step to get intermediate transformations
+        applied, transformations = replay_ops(S, ops)
 
     return applied, transformations
 
 
-def print_summary(applied: List[Dict[str, Any]], transformations: List[str]) -> None:
+def print_summary(applied: List[Dict[str, Any]], transformations: List[Sequence]) -> None:
     """
     Print alignment summary:
       - total edit distance
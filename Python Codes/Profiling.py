@@ -0,0 +1,147 @@
+#!/usr/bin/env python3
+"""
+Profiling.py
+
+Opt-in instrumentation for the edit-distance engines. Engines report
+counters (cells computed, candidates, ...), observations (recursion depth,
+early-exit row, ...) and per-phase timers through the module-level helpers
+below. Nothing is collected unless a Profiler is active:
+
+    with profiling() as prof:
+        hirschberg_with_log(a, b)
+    prof.print_report()
+
+When no profiler is active every helper returns after a single global check,
+and engines only call them once per call or per phase, never per DP cell.
+"""
+
+from collections import defaultdict
+from contextlib import contextmanager, nullcontext
+from time import perf_counter
+from typing import Any, Callable, Dict, Iterator, Optional
+import functools
+import json
+
+
+class Profiler:
+    """
+    Collected counters, observations (count/min/max/sum) and phase timers.
+    If on_event is given it is called as on_event(kind, name, value) for
+    every event, with kind one of "count", "observe" or "time".
+    """
+
+    def __init__(self, on_event: Optional[Callable[[str, str, float], None]] = None):
+        self.counters: Dict[str, int] = defaultdict(int)
+        self.observations: Dict[str, Dict[str, float]] = {}
+        self.timers: Dict[str, float] = defaultdict(float)
+        self.on_event = on_event
+
+    def count(self, name: str, n: int = 1) -> None:
+        self.counters[name] += n
+        if self.on_event is not None:
+            self.on_event("count", name, n)
+
+    def observe(self, name: str, value: float) -> None:
+        obs = self.observations.get(name)
+        if obs is None:
+            self.observations[name] = {"count": 1, "min": value, "max": value, "sum": value}
+        else:
+            obs["count"] += 1
+            obs["min"] = min(obs["min"], value)
+            obs["max"] = max(obs["max"], value)
+            obs["sum"] += value
+        if self.on_event is not None:
+            self.on_event("observe", name, value)
+
+    def add_time(self, name: str, seconds: float) -> None:
+        self.timers[name] += seconds
+        if self.on_event is not None:
+            self.on_event("time", name, seconds)
+
+    @contextmanager
+    def phase(self, name: str) -> Iterator[None]:
+        """Time the enclosed block under name."""
+        start = perf_counter()
+        try:
+            yield
+        finally:
+            self.add_time(name, perf_counter() - start)
+
+    def report(self) -> Dict[str, Any]:
+        return {
+            "counters": dict(sorted(self.counters.items())),
+            "observations": dict(sorted(self.observations.items())),
+            "timers_s": dict(sorted(self.timers.items())),
+        }
+
+    def print_report(self) -> None:
+        print("\nProfile")
+        print("=======")
+        print("Counters:")
+        for name, value in sorted(self.counters.items()):
+            print(f"  {name:<32}{value:>14}")
+        print("Observations (count / min / max / mean):")
+        for name, obs in sorted(self.observations.items()):
+            mean = obs["sum"] / obs["count"]
+            print(f"  {name:<32}{obs['count']:>8} {obs['min']:>8} {obs['max']:>8} {mean:>10.2f}")
+        print("Timers (seconds):")
+        for name, value in sorted(self.timers.items()):
+            print(f"  {name:<32}{value:>14.6f}")
+
+    def to_json(self, path: str) -> None:
+        with open(path, "w", encoding="utf-8") as fh:
+            json.dump(self.report(), fh, indent=2)
+
+
+# Profiler receiving events, or None when instrumentation is off
+_active: Optional[Profiler] = None
+_NULL = nullcontext()
+
+
+def active() -> Optional[Profiler]:
+    return _active
+
+
+@contextmanager
+def profiling(profiler: Optional[Profiler] = None) -> Iterator[Profiler]:
+    """Activate a profiler (a new one by default) for the enclosed block."""
+    global _active
+    previous = _active
+    _active = profiler if profiler is not None else Profiler()
+    try:
+        yield _active
+    finally:
+        _active = previous
+
+
+def count(name: str, n: int = 1) -> None:
+    if _active is not None:
+        _active.count(name, n)
+
+
+def observe(name: str, value: float) -> None:
+    if _active is not None:
+        _active.observe(name, value)
+
+
+def phase(name: str):
+    """Context manager timing a phase, or a shared no-op when inactive."""
+    return _active.phase(name) if _active is not None else _NULL
+
+
+def timed(name: str) -> Callable:
+    """Decorator: time every call of a function and count the calls."""
+    def decorate(fn: Callable) -> Callable:
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            prof = _active
+            if prof is None:
+                return fn(*args, **kwargs)
+            prof.count(name + ".calls")
+            start = perf_counter()
+            try:
+                return fn(*args, **kwargs)
+            finally:
+                prof.add_time(name, perf_counter() - start)
+        return wrapper
+    return decorate
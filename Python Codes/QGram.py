@@ -0,0 +1,170 @@
+#!/usr/bin/env python3
+"""
+QGram.py
+
+q-gram lower-bound prefilter for threshold queries. By the q-gram lemma,
+one edit destroys at most q of a string's q-grams, so if more than q*k
+q-grams of either string are missing from the other, the distance is > k.
+Pairs rejected here never reach Ukkonen or a full DP.
+"""
+
+from collections import OrderedDict
+from typing import Hashable, Iterator, List, Sequence, Tuple
+import sys
+
+import numpy as np
+
+from BatchDistance import encode
+from Profiling import count
+
+
+# Multiplier of the polynomial q-gram hash (wraps modulo 2**64)
+_HASH_BASE = np.uint64(1000003)
+
+
+class QGramFilter:
+    """
+    Prefilter over a fixed candidate set. Candidate q-grams are hashed once
+    at construction and packed into flat arrays; sparse query profiles are
+    kept in an LRU cache of at most cache_size strings. pruned/checked count
+    the candidates rejected/examined so far.
+    """
+
+    def __init__(self, candidates: Sequence[Sequence], q: int = 2, buckets: int = 1 << 16,
+                 cache_size: int = 1024):
+        if q < 1:
+            raise ValueError("q must be a positive integer")
+        self.q = q
+        self.buckets = buckets
+        self.candidates = candidates
+        self._gram_counts, self._flat, self._rows = self._pack(candidates)
+        self._starts = np.concatenate(([0], np.cumsum(self._gram_counts)))
+        self._lengths = np.array([len(c) for c in candidates], dtype=np.int64)
+        self.cache_size = cache_size
+        self._profiles: "OrderedDict[Hashable, Tuple[np.ndarray, np.ndarray]]" = OrderedDict()
+        self.pruned = 0
+        self.checked = 0
+
+    def grams(self, s: Sequence) -> np.ndarray:
+        """Bucketed hash codes of every q-gram of s (len(s) - q + 1 of them)."""
+        codes = encode(s).astype(np.uint64)
+        count = len(codes) - self.q + 1
+        if count <= 0:
+            return np.zeros(0, dtype=np.int64)
+        h = np.zeros(count, dtype=np.uint64)
+        for t in range(self.q):
+            h = h * _HASH_BASE + codes[t:t + count]
+        return (h % np.uint64(self.buckets)).astype(np.int64)
+
+    def _pack(self, candidates: Sequence[Sequence]) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """
+        q-grams of all candidates as flat arrays: per-candidate gram counts,
+        the concatenated bucket codes, and the candidate index of each code.
+        """
+        counts = np.array([max(len(c) - self.q + 1, 0) for c in candidates], dtype=np.int64)
+        rows = np.repeat(np.arange(len(candidates)), counts)
+        if len(candidates) and all(isinstance(c, str) for c in candidates):
+            # Hash every window of a padded code-point matrix at once
+            width = max(len(c) for c in candidates)
+            if width < self.q:
+                return counts, np.zeros(0, dtype=np.int64), rows
+            codes = np.array(candidates, dtype=f"U{width}").view(np.uint32)
+            codes = codes.reshape(len(candidates), width).astype(np.uint64)
+            span = width - self.q + 1
+            h = np.zeros((len(candidates), span), dtype=np.uint64)
+            for t in range(self.q):
+                h = h * _HASH_BASE + codes[:, t:t + span]
+            valid = np.arange(span) < counts[:, None]
+            flat = (h[valid] % np.uint64(self.buckets)).astype(np.int64)
+            return counts, flat, rows
+        grams = [self.grams(c) for c in candidates]
+        flat = np.concatenate(grams) if grams else np.zeros(0, dtype=np.int64)
+        return counts, flat, rows
+
+    def profile(self, s: Sequence) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Sparse q-gram count profile of s: the distinct hash buckets and their
+        counts, cached (LRU). Bucket collisions can only hide differences, so
+        bounds stay valid.
+        """
+        key = s if isinstance(s, Hashable) else tuple(s)
+        prof = self._profiles.get(key)
+        if prof is None:
+            prof = np.unique(self.grams(s), return_counts=True)
+            self._profiles[key] = prof
+            if len(self._profiles) > self.cache_size:
+                self._profiles.popitem(last=False)
+        else:
+            self._profiles.move_to_end(key)
+        return prof
+
+    def _bounds(self, codes: np.ndarray, nq: int, length: int, start: int = 0) -> np.ndarray:
+        """
+        Lower bounds against candidates start, start + 1, ... for a string of
+        the given length with nq q-grams falling into the distinct buckets codes.
+        """
+        # Only the q-grams of the requested candidates are scanned
+        offset = self._starts[start]
+        hits = np.isin(self._flat[offset:], codes).astype(np.int64)
+        # Shared q-grams, over-counted when a candidate repeats a q-gram
+        common = np.bincount(self._rows[offset:] - start, weights=hits,
+                             minlength=len(self.candidates) - start)
+        common = np.minimum(common.astype(np.int64), nq)
+        missing = np.maximum(self._gram_counts[start:] - common, nq - common)
+        bound = -(-missing // self.q)  # ceil(missing / q)
+        return np.maximum(bound, np.abs(self._lengths[start:] - length))
+
+    def lower_bounds(self, query: Sequence) -> np.ndarray:
+        """Lower bound on the distance from query to every candidate."""
+        codes, _ = self.profile(query)
+        return self._bounds(codes, max(len(query) - self.q + 1, 0), len(query))
+
+    def survivors(self, query: Sequence, k: int) -> np.ndarray:
+        """Indices of candidates that may lie within distance k of query."""
+        keep = np.flatnonzero(self.lower_bounds(query) <= k)
+        self.checked += len(self.candidates)
+        self.pruned += len(self.candidates) - len(keep)
+        count("qgram.checked", len(self.candidates))
+        count("qgram.pruned", len(self.candidates) - len(keep))
+        return keep
+
+    def candidate_pairs(self, k: int) -> Iterator[Tuple[int, int]]:
+        """Pairs (i, j), i < j, of candidates that may lie within distance k."""
+        for i in range(len(self.candidates)):
+            # Candidate i's q-grams are already packed; no profile is cached
+            codes = np.unique(self._flat[self._starts[i]:self._starts[i + 1]])
+            nq = int(self._gram_counts[i])
+            bound = self._bounds(codes, nq, int(self._lengths[i]), start=i + 1)
+            keep = np.flatnonzero(bound <= k)
+            self.checked += len(bound)
+            self.pruned += len(bound) - len(keep)
+            count("qgram.checked", len(bound))
+            count("qgram.pruned", len(bound) - len(keep))
+            for j in keep:
+                yield i, i + 1 + int(j)
+
+
+def main(argv: List[str] = None) -> int:
+    """
+    Main function: report which candidates survive the filter for threshold k.
+    Takes input manually if fewer than three arguments are given.
+    """
+    if argv is None:
+        argv = sys.argv[1:]
+
+    if len(argv) >= 3:
+        query, k, candidates = argv[0], int(argv[1]), argv[2:]
+    else:
+        query = input("Enter query string: ").strip()
+        k = int(input("Enter threshold k: ").strip())
+        candidates = input("Enter candidate strings (space separated): ").split()
+
+    qfilter = QGramFilter(candidates)
+    keep = qfilter.survivors(query, k)
+    print(f"Survivors: {[candidates[i] for i in keep]}")
+    print(f"Pruned {qfilter.pruned} of {qfilter.checked} candidates.")
+    return 0
+
+
+if __name__ == "__main__":
+    main()
@@ -1,5 +1,6 @@
 import pandas as pd
-import numpy as np
+
+from DistanceStore import CondensedDistanceStore
 
 # ---------- Step 1: Read Data ----------
 df = pd.read_csv("C:/Users/ADRIJA/OneDrive/Documents/SARS-COV 2 VARIANTS.csv")
@@ -8,36 +9,16 @@ df = pd.read_csv("C:/Users/ADRIJA/OneDrive/Documents/SARS-COV 2 VARIANTS.csv")
 variants = df["Variant"].tolist()
 genomes = df["Genome"].tolist()
 
-n = len(variants)
-matrix = np.zeros((n, n))
-
-# ---------- Step 2: Two-row Wagner–Fischer Algorithm ----------
-def wagner_fischer_two_row(a: str, b: str) -> int:
-    """Compute Levenshtein distance using O(min(len(a), len(b))) space."""
-    if len(a) < len(b):
-        a, b = b, a  # ensure a is the longer string
-    prev = list(range(len(b) + 1))
-    for i in range(1, len(a) + 1):
-        curr = [i] + [0] * len(b)
-        for j in range(1, len(b) + 1):
-            cost = 0 if a[i - 1] == b[j - 1] else 1
-            curr[j] = min(prev[j] + 1, curr[j - 1] + 1, prev[j - 1] + cost)
-        prev = curr
-    return prev[-1]
+# ---------- Step 2: Update the Condensed Distance Store ----------
+# Distances persist in Variant_Distances.npy/.json; only pairs involving
+# variants not seen before are computed (n new pairs per new variant).
+store = CondensedDistanceStore("Variant_Distances")
+computed = store.update(variants, genomes)
+print(f"{computed} new distances computed ({len(store)} variants stored).")
 
-# ---------- Step 3: Compute Normalized Distance Matrix ----------
-for i in range(n):
-    for j in range(n):
-        if i == j:
-            matrix[i, j] = 0.0
-        else if i<j:
-            d = wagner_fischer_two_row(genomes[i], genomes[j])
-            matrix[i, j] = d / (len(genomes[i]) + len(genomes[j]))
-for i in range(n):
-    for j in range(i):
-        matrix[i,j]=matrix[j,i]
-# ---------- Step 4: Create and Save Matrix ----------
-distance_df = pd.DataFrame(matrix, index=variants, columns=variants)
+# ---------- Step 3: Create and Save Matrix ----------
+# Normalized matrix is a view over the store: d / (len(a) + len(b))
+distance_df = store.to_dataframe(normalized=True)
 distance_df.to_csv("Variant_Distance_Matrix.csv", index=True)
 
 print(distance_df)
@@ -5,8 +5,12 @@ Simple Levenshtein-based spell checker using NLTK words corpus.
 
 import nltk
 from nltk.corpus import words
+import numpy as np
 import sys
 
+from BatchDistance import IncrementalLevenshtein, distances
+from QGram import QGramFilter
+
 # Make sure the NLTK 'words' corpus is downloaded
 try:
     nltk.data.find('corpora/words')
@@ -15,31 +19,46 @@ except LookupError:
 
 # Load dictionary
 DICTIONARY = set(words.words())  # Use set for faster lookup
-
-# --- Levenshtein Distance Function ---
-def levenshtein_distance(a: str, b: str) -> int:
-    """Compute the Levenshtein distance between two strings."""
-    m, n = len(a), len(b)
-    if m == 0:
-        return n
-    if n == 0:
-        return m
-
-    prev = list(range(n + 1))
-    curr = [0] * (n + 1)
-
-    for i in range(1, m + 1):
-        curr[0] = i
-        for j in range(1, n + 1):
-            cost = 0 if a[i - 1] == b[j - 1] else 1
-            curr[j] = min(
-                prev[j - 1] + cost,  # substitution/match
-                prev[j] + 1,         # deletion
-                curr[j - 1] + 1      # insertion
-            )
-        prev, curr = curr, prev
-
-    return prev[n]
+# Lower-cased candidate list, built once and reused for every misspelt word
+CANDIDATES = sorted({w.lower() for w in DICTIONARY})
+# q-gram profiles of the dictionary, used to skip words that cannot be closest
+QFILTER = QGramFilter(CANDIDATES, q=2)
+
+def closest_words(word: str):
+    """
+    Find the dictionary words closest to word.
+    Thresholds k = 0, 1, 2, ... are tried in turn and only words whose q-gram
+    lower bound is <= k are passed to the DP, so the scan stops as soon as
+    some word lies within k.
+    Returns (distance, suggestions, number of words pruned by the filter).
+    """
+    bounds = QFILTER.lower_bounds(word)
+    order = np.argsort(bounds, kind="stable")
+    sorted_bounds = bounds[order]
+
+    checked = 0
+    min_dist = None
+    best_idx = []
+    k = int(sorted_bounds[0])
+    while True:
+        # Scan every word whose bound is <= k before deciding to stop
+        upto = int(np.searchsorted(sorted_bounds, k, side="right"))
+        if upto > checked:
+            new = order[checked:upto]
+            dists = distances(word, [CANDIDATES[i] for i in new])
+            d = int(dists.min())
+            if min_dist is None or d < min_dist:
+                min_dist, best_idx = d, []
+            if d == min_dist:
+                best_idx.extend(new[dists == d].tolist())
+            checked = upto
+        # Unscanned words have bound > k, hence distance > k >= min_dist
+        if min_dist is not None and min_dist <= k:
+            break
+        k += 1
+
+    suggestions = [CANDIDATES[i] for i in sorted(best_idx)]
+    return min_dist, suggestions, len(CANDIDATES) - checked
 
 
 # --- Main Spell Checker ---
@@ -62,21 +81,34 @@ def spell_check():
     unique_wrong_words = list(set(wrong_words))  # deduplicate first
 
     for w in unique_wrong_words:
-        min_dist = float("inf")
-        suggestions = []
-
-        for dict_word in DICTIONARY:
-            dict_word = dict_word.lower()
-            dist = levenshtein_distance(w, dict_word)
-            if dist < min_dist:
-                min_dist = dist
-                suggestions = [dict_word]
-            elif dist == min_dist:
-                suggestions.append(dict_word)
+        min_dist, suggestions, pruned = closest_words(w)
 
         print(
             f"‘{w}’: Spelling error. Suggestions (distance {min_dist}): {suggestions[:10]}{'...' if len(suggestions) > 10 else ''}")
+        print(f"   (q-gram filter pruned {pruned} of {len(CANDIDATES)} dictionary words)")
+
+# --- Live Suggestions ---
+def live_suggest():
+    """
+    Typeahead mode: each line entered is the word typed so far. Rows for the
+    prefix shared with the previous line are reused, so every keystroke only
+    costs one DP row per dictionary word. An empty line exits.
+    """
+    tracker = IncrementalLevenshtein(CANDIDATES)
+    while True:
+        word = input("Type a word (empty line to quit): ").strip().lower()
+        if not word:
+            return
+        tracker.set_query(word)
+        dists = tracker.distances()
+        min_dist = int(dists.min())
+        suggestions = [CANDIDATES[i] for i in np.flatnonzero(dists == min_dist)]
+        print(f"   distance {min_dist}: {suggestions[:10]}{'...' if len(suggestions) > 10 else ''}")
+
 
 # --- Run ---
 if __name__ == "__main__":
-    spell_check()
+    if "--live" in sys.argv[1:]:
+        live_suggest()
+    else:
+        spell_check()
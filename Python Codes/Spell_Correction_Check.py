@@ -0,0 +1,53 @@
+#!/usr/bin/env python3
+"""
+Spell_Correction_Check.py
+
+Brute-force check of Spell_Correction.closest_words: for random garbled
+dictionary words it must return the same distance and suggestion list as a
+full distances(word, CANDIDATES) scan. Slow (one full dictionary scan per
+query), so it is kept out of the spell checker itself.
+Usage: Spell_Correction_Check.py [<sample size> [<seed>]]
+"""
+
+from typing import List
+import sys
+
+import numpy as np
+
+from BatchDistance import distances
+from Spell_Correction import CANDIDATES, closest_words
+
+
+def check_closest_words(sample: int = 200, seed: int = 0) -> bool:
+    """Compare closest_words against brute force; mismatches are printed."""
+    rng = np.random.default_rng(seed)
+    letters = "abcdefghijklmnopqrstuvwxyz"
+    ok = True
+    for idx in rng.integers(0, len(CANDIDATES), size=sample):
+        word = list(CANDIDATES[idx])
+        for _ in range(int(rng.integers(0, 4))):
+            word.insert(int(rng.integers(0, len(word) + 1)), letters[int(rng.integers(0, 26))])
+        word = "".join(word)
+
+        dists = distances(word, CANDIDATES)
+        min_dist = int(dists.min())
+        expected = [CANDIDATES[i] for i in np.flatnonzero(dists == min_dist)]
+        got_dist, got, _ = closest_words(word)
+        if got_dist != min_dist or got != expected:
+            print(f"Mismatch for {word!r}: got {len(got)} words at distance {got_dist}, "
+                  f"expected {len(expected)} at distance {min_dist}")
+            ok = False
+    print("closest_words check passed." if ok else "closest_words check FAILED.")
+    return ok
+
+
+def main(argv: List[str] = None) -> int:
+    if argv is None:
+        argv = sys.argv[1:]
+    sample = int(argv[0]) if argv else 200
+    seed = int(argv[1]) if len(argv) >= 2 else 0
+    return 0 if check_closest_words(sample, seed) else 1
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,75 @@
+#!/usr/bin/env python3
+"""
+Tokenize.py
+
+Word-level tokenizer with an interning vocabulary. Texts are split into words
+and punctuation marks, and each distinct token is mapped to a compact integer
+ID, so a word-level edit distance runs on small integer arrays instead of
+long strings. One Vocabulary is meant to be shared across a whole corpus file.
+"""
+
+from typing import Dict, List
+import re
+import sys
+
+import numpy as np
+
+
+# Punctuation split off as separate tokens (includes the Devanagari danda)
+_PUNCT = r"""\.,;:!?"'()\[\]{}“”‘’…।॥\-–—"""
+_TOKEN_RE = re.compile(rf"[{_PUNCT}]|[^\s{_PUNCT}]+")
+
+
+def tokenize(text: str, lower: bool = True) -> List[str]:
+    """Split text into words and punctuation marks."""
+    if lower:
+        text = text.lower()
+    return _TOKEN_RE.findall(text)
+
+
+class Vocabulary:
+    """Interns tokens into consecutive integer IDs (0, 1, 2, ...)."""
+
+    def __init__(self, lower: bool = True):
+        self.lower = lower
+        self.ids: Dict[str, int] = {}
+        self.tokens: List[str] = []
+
+    def __len__(self) -> int:
+        return len(self.tokens)
+
+    def intern(self, token: str) -> int:
+        """ID of token, assigning the next free ID on first sight."""
+        tid = self.ids.get(token)
+        if tid is None:
+            tid = self.ids[token] = len(self.tokens)
+            self.tokens.append(token)
+        return tid
+
+    def encode(self, text: str) -> np.ndarray:
+        """Tokenize text and return its token IDs as an int32 array."""
+        return np.array([self.intern(t) for t in tokenize(text, self.lower)], dtype=np.int32)
+
+    def decode(self, ids) -> List[str]:
+        """Tokens for a sequence of IDs."""
+        return [self.tokens[i] for i in ids]
+
+
+def main(argv: List[str] = None) -> int:
+    """
+    Main function: show the tokens and IDs of a text.
+    Takes input manually if no argument is given.
+    """
+    if argv is None:
+        argv = sys.argv[1:]
+
+    text = " ".join(argv) if argv else input("Enter text: ")
+    vocab = Vocabulary()
+    ids = vocab.encode(text)
+    print(f"Tokens: {vocab.decode(ids)}")
+    print(f"IDs:    {ids.tolist()}")
+    return 0
+
+
+if __name__ == "__main__":
+    main()
@@ -1,9 +1,15 @@
+from typing import Sequence
 import sys
 
-def levenshtein_distance_two_row(S: str, T: str) -> int:
+from Profiling import count, timed
+
+
+@timed("two_row")
+def levenshtein_distance_two_row(S: Sequence, T: Sequence) -> int:
     """
-    Compute the Levenshtein distance between strings S and T
-    using the two-row optimization (space-efficient version).
+    Compute the Levenshtein distance between sequences S and T (strings,
+    token lists or integer arrays) using the two-row optimization
+    (space-efficient version).
     
     Time Complexity: O(mn)
     Space Complexity: O(min(m, n))
@@ -14,6 +20,7 @@ def levenshtein_distance_two_row(S: str, T: str) -> int:
     if n > m:
         S, T = T, S
         m, n = n, m
+    count("two_row.cells", m * n)
 
     # prev: previous row of DP table
     prev = list(range(n + 1))  # base case: distance from empty string
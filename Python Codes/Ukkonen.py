@@ -1,5 +1,13 @@
+from typing import Iterable, Iterator, List, Optional, Sequence, Tuple
+import itertools
 import sys
 
+from BatchDistance import build_peq
+from Profiling import count, observe, timed
+from QGram import QGramFilter
+
+
+@timed("ukkonen")
 def ukkonen_levenshtein(a: str, b: str, k: int) -> int | None:
     """
     Compute Levenshtein distance between strings a and b up to a threshold k
@@ -10,21 +18,26 @@ def ukkonen_levenshtein(a: str, b: str, k: int) -> int | None:
 
     # Quick rejection: if length difference exceeds threshold, distance > k
     if abs(m - n) > k:
+        count("ukkonen.length_reject")
         return None
+    if n == 0:
+        return m
 
     # Initialize previous row of DP table (only within band [0..k])
     prev = list(range(min(n, k) + 1))
-    # Current row (initialized later in loop)
-    curr = [0] * (n + 1)
-
     # Infinite value outside band
     INF = k + 1
 
+    # Current row: cells outside the band must read as INF in the next row
+    curr = [INF] * (n + 1)
+    cells = 0  # band cells computed (reported to the profiler)
+
     # Fill DP table row by row
     for i in range(1, m + 1):
         # Band limits for current row
         low = max(1, i - k)
         high = min(n, i + k)
+        cells += high - low + 1
 
         # Initialize first column of current row (only valid if low == 1)
         curr[0] = i if low == 1 else INF
@@ -43,23 +56,165 @@ def ukkonen_levenshtein(a: str, b: str, k: int) -> int | None:
 
         # Early termination: if all costs in band > k, distance exceeds threshold
         if min(curr[low:high + 1]) > k:
+            count("ukkonen.cells", cells)
+            observe("ukkonen.early_exit_row", i)
             return None
 
         # Prepare for next iteration: swap rows, reset current row to INF
         prev, curr = curr, [INF] * (n + 1)
 
+    count("ukkonen.cells", cells)
     # Return final distance if within threshold, else None
     return prev[n] if prev[n] <= k else None
 
 
+def ukkonen_search(query: str, candidates: Sequence[str], k: int,
+                   qfilter: Optional[QGramFilter] = None) -> List[Tuple[int, int]]:
+    """
+    Threshold search: return (index, distance) for every candidate within
+    distance k of query. If a QGramFilter built over the same candidates is
+    given, only its survivors are checked with Ukkonen's algorithm.
+    """
+    indices = range(len(candidates)) if qfilter is None else qfilter.survivors(query, k)
+    hits = []
+    for idx in indices:
+        dist = ukkonen_levenshtein(query, candidates[idx], k)
+        if dist is not None:
+            hits.append((int(idx), dist))
+    return hits
+
+
+def ukkonen_pairs(strings: Sequence[str], k: int,
+                  qfilter: Optional[QGramFilter] = None) -> List[Tuple[int, int, int]]:
+    """
+    Thresholded pairwise job: return (i, j, distance), i < j, for every pair
+    of strings within distance k. If a QGramFilter built over the same
+    strings is given, only its candidate_pairs are checked with Ukkonen's
+    algorithm.
+    """
+    pairs: Iterable[Tuple[int, int]] = (itertools.combinations(range(len(strings)), 2)
+                                        if qfilter is None else qfilter.candidate_pairs(k))
+    hits = []
+    for i, j in pairs:
+        dist = ukkonen_levenshtein(strings[i], strings[j], k)
+        if dist is not None:
+            hits.append((i, j, dist))
+    return hits
+
+
+def sellers_search(pattern: str, text: str, k: int) -> Iterator[Tuple[int, int]]:
+    """
+    Approximate substring search (Sellers) with Ukkonen's cutoff.
+    The match may start anywhere in text (row 0 of every column is 0), and
+    only the active prefix of the column, up to the last row whose value is
+    <= k, is computed. Yields (end, distance) for every text index end such
+    that some substring of text ending at end is within k edits of pattern.
+    Expected time O(k * len(text)).
+    """
+    m = len(pattern)
+    if m == 0:
+        return
+
+    # Column of the DP table over pattern prefixes; C[0] stays 0 (free start)
+    C = list(range(m + 1))
+    # Last active row: deepest row that may still hold a value <= k
+    lact = min(k + 1, m)
+    cells = 0  # active cells computed (reported to the profiler)
+
+    try:
+        for pos, ch in enumerate(text):
+            diag = 0   # C[i - 1] of the previous column
+            above = 0  # C[i - 1] of the current column
+            cells += lact
+            for i in range(1, lact + 1):
+                if pattern[i - 1] == ch:
+                    cur = diag
+                else:
+                    cur = min(diag, above, C[i]) + 1
+                diag = C[i]
+                C[i] = above = cur
+
+            # Shrink the active prefix past rows that exceed k
+            while lact > 0 and C[lact] > k:
+                lact -= 1
+            if lact == m:
+                yield pos, C[m]
+            else:
+                lact += 1
+    finally:
+        count("sellers.cells", cells)
+
+
+def bit_parallel_search(pattern: str, text: str, k: int) -> Iterator[Tuple[int, int]]:
+    """
+    Bit-parallel variant of sellers_search (Myers' algorithm): the whole
+    column is held as bit-vectors of vertical deltas built from the
+    pattern's character-position bitmasks. Same output as sellers_search.
+    """
+    m = len(pattern)
+    if m == 0:
+        return
+
+    peq = build_peq(pattern)
+    mask = (1 << m) - 1
+    top = 1 << (m - 1)
+    pv, mv, score = mask, 0, m
+    steps = 0  # text characters processed (reported to the profiler)
+    try:
+        for pos, ch in enumerate(text):
+            steps += 1
+            eq = peq.get(ch, 0)
+            xv = eq | mv
+            xh = (((eq & pv) + pv) ^ pv) | eq
+            ph = mv | (~(xh | pv) & mask)
+            mh = pv & xh
+            if ph & top:
+                score += 1
+            elif mh & top:
+                score -= 1
+            # Row 0 stays 0 (free start), so no carry enters the shifted deltas
+            ph = (ph << 1) & mask
+            mh = (mh << 1) & mask
+            pv = mh | (~(xv | ph) & mask)
+            mv = ph & xv
+            if score <= k:
+                yield pos, score
+    finally:
+        count("bitparallel_search.steps", steps)
+
+
 def main(argv=None) -> int:
     """
     Main CLI interface.
+    Usage: Ukkonen.py <a> <b> <k>
+           Ukkonen.py --search <query> <k> <candidate> ...   (candidates within k)
+           Ukkonen.py --pairs <k> <string> ...               (pairs within k)
+    The threshold modes prefilter with q-grams before running Ukkonen.
     Accepts manual input
     """
     if argv is None:
         argv = sys.argv[1:]
 
+    if argv[:1] == ["--search"] and len(argv) >= 4:
+        query, k, candidates = argv[1], int(argv[2]), argv[3:]
+        qfilter = QGramFilter(candidates)
+        hits = ukkonen_search(query, candidates, k, qfilter)
+        for idx, dist in hits:
+            print(f"{candidates[idx]}: {dist}")
+        print(f"{len(hits)} candidates within distance {k} "
+              f"(q-gram filter pruned {qfilter.pruned} of {qfilter.checked}).")
+        return 0 if hits else 1
+
+    if argv[:1] == ["--pairs"] and len(argv) >= 3:
+        k, strings = int(argv[1]), argv[2:]
+        qfilter = QGramFilter(strings)
+        hits = ukkonen_pairs(strings, k, qfilter)
+        for i, j, dist in hits:
+            print(f"{strings[i]} - {strings[j]}: {dist}")
+        print(f"{len(hits)} pairs within distance {k} "
+              f"(q-gram filter pruned {qfilter.pruned} of {qfilter.checked}).")
+        return 0 if hits else 1
+
     # Parse input from argv or interactive input
     if len(argv) >= 3:
         a, b, k = argv[0], argv[1], int(argv[2])
@@ -3,14 +3,74 @@
 wagner_fischer_fixed.py
 
 Compute Levenshtein distance with Wagner-Fischer algorithm, including a correct
-operation log and step-by-step transformations. Positions are adjusted when
-replaying operations to account for previous inserts/deletes.
+operation log and step-by-step transformations. Replaying the operations left
+to right gives each one its position in the partly transformed string.
 """
 
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Sequence, Tuple
 import pprint
 
-def wagner_fischer_with_log(s: str, t: str) -> Dict[str, Any]:
+import numpy as np
+
+from Profiling import count, phase, timed
+
+
+def _render(cur: List[Any], like: Sequence) -> Sequence:
+    """Snapshot of the working sequence: a string for string input, else a list."""
+    return "".join(cur) if isinstance(like, str) else list(cur)
+
+
+def replay_ops(source: Sequence, ops: List[Dict[str, Any]]) -> Tuple[List[Dict[str, Any]], List[Sequence]]:
+    """
+    Apply chronological match/substitute/delete/insert operations to source.
+    Operations run left to right, so a cursor into the current string gives
+    each operation's position after all earlier inserts/deletes; positions
+    stored in ops are ignored. Returns the operations with those positions
+    and the string after each one (lists for non-string input).
+    """
+    cur: List[Any] = list(source)  # current string state
+    transformations: List[Sequence] = [_render(cur, source)]  # list of string states
+    applied: List[Dict[str, Any]] = []  # chronological operations applied
+    pos = 0  # cursor: index in cur of the next unprocessed source element
+
+    for action in ops:
+        if action["op"] == "match":
+            # Match does not modify string
+            applied.append({"op": "match", "pos": pos, "char": cur[pos]})
+            pos += 1
+
+        elif action["op"] == "substitute":
+            old = cur[pos]
+            cur[pos] = action["to"]
+            applied.append({"op": "substitute", "pos": pos, "from": old, "to": action["to"]})
+            pos += 1
+
+        elif action["op"] == "delete":
+            removed = cur.pop(pos)
+            applied.append({"op": "delete", "pos": pos, "char": removed})
+
+        elif action["op"] == "insert":
+            cur.insert(pos, action["char"])
+            applied.append({"op": "insert", "pos": pos, "char": action["char"]})
+            pos += 1
+
+        transformations.append(_render(cur, source))
+
+    return applied, transformations
+
+
+@timed("wagner")
+def wagner_fischer_with_log(s: Sequence, t: Sequence) -> Dict[str, Any]:
+    """
+    Levenshtein distance between sequences s and t (strings, token lists or
+    integer arrays) with the operation log and step-by-step transformations.
+    """
+    # NumPy arrays (e.g. Vocabulary.encode output) become lists so that ops and
+    # transformations hold plain ints
+    if isinstance(s, np.ndarray):
+        s = s.tolist()
+    if isinstance(t, np.ndarray):
+        t = t.tolist()
     m, n = len(s), len(t)
     
     # Initialize distance matrix D (size (m+1)x(n+1))
@@ -28,110 +88,60 @@ def wagner_fischer_with_log(s: str, t: str) -> Dict[str, Any]:
         D[0][j] = j  # cost of inserting all characters of t[:j]
         choice[0][j] = "start" if j == 0 else "insert"
 
-    # Fill DP table
-    for i in range(1, m + 1):
-        for j in range(1, n + 1):
-            # Cost of substitution or match
-            cost_diag = D[i - 1][j - 1] + (0 if s[i - 1] == t[j - 1] else 1)
-            # Cost of deletion
-            cost_del = D[i - 1][j] + 1
-            # Cost of insertion
-            cost_ins = D[i][j - 1] + 1
-
-            # Choose minimal cost
-            best = min(cost_diag, cost_del, cost_ins)
-            D[i][j] = best
-
-            # Tie-breaking: prefer diagonal (match/substitute) > delete > insert
-            if best == cost_diag:
-                choice[i][j] = "match" if s[i - 1] == t[j - 1] else "substitute"
-            elif best == cost_del:
-                choice[i][j] = "delete"
+    count("wagner.cells", m * n)
+    with phase("wagner.fill"):
+        # Fill DP table
+        for i in range(1, m + 1):
+            for j in range(1, n + 1):
+                # Cost of substitution or match
+                cost_diag = D[i - 1][j - 1] + (0 if s[i - 1] == t[j - 1] else 1)
+                # Cost of deletion
+                cost_del = D[i - 1][j] + 1
+                # Cost of insertion
+                cost_ins = D[i][j - 1] + 1
+
+                # Choose minimal cost
+                best = min(cost_diag, cost_del, cost_ins)
+                D[i][j] = best
+
+                # Tie-breaking: prefer diagonal (match/substitute) > delete > insert
+                if best == cost_diag:
+                    choice[i][j] = "match" if s[i - 1] == t[j - 1] else "substitute"
+                elif best == cost_del:
+                    choice[i][j] = "delete"
+                else:
+                    choice[i][j] = "insert"
+
+    with phase("wagner.backtrack"):
+        # Backtrack to generate reverse-chronological operation list
+        i, j = m, n
+        rev_ops: List[Dict[str, Any]] = []
+        while i > 0 or j > 0:
+            op = choice[i][j]
+            if op == "match":
+                rev_ops.append({"op": "match", "pos": i - 1, "char": s[i - 1]})
+                i, j = i - 1, j - 1
+            elif op == "substitute":
+                rev_ops.append({"op": "substitute", "pos": i - 1,
+                                "from": s[i - 1], "to": t[j - 1]})
+                i, j = i - 1, j - 1
+            elif op == "delete":
+                rev_ops.append({"op": "delete", "pos": i - 1, "char": s[i - 1]})
+                i -= 1
+            elif op == "insert":
+                rev_ops.append({"op": "insert", "pos": i, "char": t[j - 1]})
+                j -= 1
             else:
-                choice[i][j] = "insert"
-
-    # Backtrack to generate reverse-chronological operation list
-    i, j = m, n
-    rev_ops: List[Dict[str, Any]] = []
-    while i > 0 or j > 0:
-        op = choice[i][j]
-        if op == "match":
-            rev_ops.append({"op": "match", "pos": i - 1, "char": s[i - 1]})
-            i, j = i - 1, j - 1
-        elif op == "substitute":
-            rev_ops.append({"op": "substitute", "pos": i - 1,
-                            "from": s[i - 1], "to": t[j - 1]})
-            i, j = i - 1, j - 1
-        elif op == "delete":
-            rev_ops.append({"op": "delete", "pos": i - 1, "char": s[i - 1]})
-            i -= 1
-        elif op == "insert":
-            rev_ops.append({"op": "insert", "pos": i, "char": t[j - 1]})
-            j -= 1
-        else:
-            break
+                break
 
     # Reverse ops to chronological order
     ops = list(reversed(rev_ops))
 
-    # Helper function: adjust original position to current string index
-    # considering previously applied insertions and deletions
-    def adjusted_pos(original_pos: int, applied_ops: List[Dict[str, Any]]) -> int:
-        shift = 0
-        for a in applied_ops:
-            p = a["pos"]
-            if a["op"] == "insert" and p <= original_pos:
-                shift += 1
-            elif a["op"] == "delete" and p < original_pos:
-                shift -= 1
-        return original_pos + shift
-
-    # Apply operations step-by-step to reconstruct intermediate strings
-    cur: List[str] = list(s)  # current string state
-    transformations: List[str] = ["".join(cur)]  # list of string states
-    applied_ops: List[Dict[str, Any]] = []  # chronological operations applied
-
-    for action in ops:
-        if action["op"] == "match":
-            # Match does not modify string
-            pos = adjusted_pos(action["pos"], applied_ops)
-            applied_ops.append({"op": "match", "pos": pos,
-                                "char": cur[pos] if 0 <= pos < len(cur) else None})
-            transformations.append("".join(cur))
-
-        elif action["op"] == "substitute":
-            orig_pos = action["pos"]
-            pos = adjusted_pos(orig_pos, applied_ops)
-            to_char = action["to"]
-            if 0 <= pos < len(cur):
-                old = cur[pos]
-                cur[pos] = to_char
-                applied_ops.append({"op": "substitute", "pos": pos, "from": old, "to": to_char})
-            else:
-                applied_ops.append({"op": "substitute", "pos": pos, "from": None, "to": to_char})
-            transformations.append("".join(cur))
-
-        elif action["op"] == "delete":
-            orig_pos = action["pos"]
-            pos = adjusted_pos(orig_pos, applied_ops)
-            if 0 <= pos < len(cur):
-                removed = cur.pop(pos)
-                applied_ops.append({"op": "delete", "pos": pos, "char": removed})
-            else:
-                applied_ops.append({"op": "delete", "pos": pos, "char": None})
-            transformations.append("".join(cur))
-
-        elif action["op"] == "insert":
-            orig_pos = action["pos"]
-            pos = adjusted_pos(orig_pos, applied_ops)
-            pos = max(0, min(pos, len(cur)))  # clamp to valid range
-            cur.insert(pos, action["char"])
-            applied_ops.append({"op": "insert", "pos": pos, "char": action["char"]})
-            transformations.append("".join(cur))
+    with phase("wagner.replay"):
+        # Apply operations step-by-step to reconstruct intermediate strings
+        applied_ops, transformations = replay_ops(s, ops)
 
-        else:
-            # Unknown operation: append current state
-            transformations.append("".join(cur))
+    count("wagner.replay_ops", len(ops))
 
     return {
         "distance": D[m][n],           # final Levenshtein distance
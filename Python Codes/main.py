@@ -6,16 +6,20 @@ Menu + CLI runner that imports the three algorithms:
  - wagner_fischer_with_log (from WagnerFischer.py)
  - hirschberg_with_log   (from Hirschberg.py)
  - ukkonen_levenshtein  (from Ukkonen.py)
+ - sellers_search       (from Ukkonen.py, approximate substring search)
 """
 
 from typing import Optional
 import argparse
+import cProfile
 import pprint
 import sys
 
 from WagnerFischer import wagner_fischer_with_log
 from Hirschberg import hirschberg_with_log
-from Ukkonen import ukkonen_levenshtein
+from Ukkonen import ukkonen_levenshtein, sellers_search, bit_parallel_search
+from Tokenize import tokenize
+from Profiling import profiling
 
 
 pp = pprint.PrettyPrinter(width=120, compact=False)
@@ -53,15 +57,27 @@ def run_ukkonen(a: str, b: str, k: int) -> None:
         print(f"Levenshtein distance = {res}")
 
 
+def run_search(pattern: str, text: str, k: int, bit_parallel: bool = False) -> None:
+    print("\n==== Approximate substring search (Sellers + Ukkonen cutoff) ====")
+    search = bit_parallel_search if bit_parallel else sellers_search
+    found = 0
+    for end, dist in search(pattern, text, k):
+        print(f"  end={end:6d}  distance={dist}")
+        found += 1
+    if not found:
+        print(f"No occurrence within distance {k}.")
+
+
 def interactive_menu() -> None:
     while True:
         print("\n=== Edit Distance Algorithms ===")
         print("1) Wagner–Fischer (full DP, logs)")
         print("2) Hirschberg (divide & conquer, logs)")
         print("3) Ukkonen (bounded Levenshtein)")
-        print("4) Exit")
-        choice = input("Choose [1-4]: ").strip()
-        if choice == "4":
+        print("4) Approximate substring search (pattern in text)")
+        print("5) Exit")
+        choice = input("Choose [1-5]: ").strip()
+        if choice == "5":
             print("Goodbye!")
             return
 
@@ -79,6 +95,13 @@ def interactive_menu() -> None:
                 print("Invalid k — must be integer. Returning to menu.")
                 continue
             run_ukkonen(a, b, k)
+        elif choice == "4":
+            try:
+                k = int(input("Enter threshold k (non-negative integer): ").strip())
+            except ValueError:
+                print("Invalid k — must be integer. Returning to menu.")
+                continue
+            run_search(a, b, k)
         else:
             print("Invalid choice — try again.")
 
@@ -87,6 +110,9 @@ def cli_run(args: argparse.Namespace) -> int:
     a = args.a
     b = args.b
     mode = args.mode.lower()
+    if args.words:
+        # Word-level edit distance: every algorithm accepts token sequences
+        a, b = tokenize(a), tokenize(b)
 
     if mode == "wagner":
         run_wagner(a, b)
@@ -97,6 +123,11 @@ def cli_run(args: argparse.Namespace) -> int:
             print("Error: --k is required for ukkonen mode.", file=sys.stderr)
             return 2
         run_ukkonen(a, b, args.k)
+    elif mode == "search":
+        if args.k is None:
+            print("Error: --k is required for search mode.", file=sys.stderr)
+            return 2
+        run_search(a, b, args.k, args.bit_parallel)
     else:
         print(f"Unknown mode: {args.mode}", file=sys.stderr)
         return 2
@@ -105,18 +136,25 @@ def cli_run(args: argparse.Namespace) -> int:
 
 def build_parser() -> argparse.ArgumentParser:
     p = argparse.ArgumentParser(prog="main.py", description="Run edit-distance algorithms.")
-    p.add_argument("--mode", choices=["wagner", "hirschberg", "ukkonen"],
+    p.add_argument("--mode", choices=["wagner", "hirschberg", "ukkonen", "search"],
                    help="Run a specific algorithm non-interactively. If omitted, runs interactive menu.")
-    p.add_argument("--a", help="First string (required when --mode provided).")
-    p.add_argument("--b", help="Second string (required when --mode provided).")
-    p.add_argument("--k", type=int, help="Threshold k (required for ukkonen mode).")
+    p.add_argument("--a", help="First string (required when --mode provided; the pattern in search mode).")
+    p.add_argument("--b", help="Second string (required when --mode provided; the text in search mode).")
+    p.add_argument("--k", type=int, help="Threshold k (required for ukkonen and search modes).")
+    p.add_argument("--words", action="store_true",
+                   help="Compare word tokens instead of characters.")
+    p.add_argument("--bit-parallel", action="store_true",
+                   help="Use the bit-parallel engine in search mode.")
+    p.add_argument("--profile", action="store_true",
+                   help="Collect engine counters and phase timers and print them at the end.")
+    p.add_argument("--profile-json", metavar="PATH",
+                   help="Also write the collected counters and timers to PATH as JSON.")
+    p.add_argument("--cprofile", metavar="PATH",
+                   help="Also run under cProfile and dump the stats to PATH.")
     return p
 
 
-def run() -> int:
-    parser = build_parser()
-    args = parser.parse_args()
-
+def dispatch(parser: argparse.ArgumentParser, args: argparse.Namespace) -> int:
     # If mode provided, require a and b
     if args.mode:
         if not args.a or not args.b:
@@ -133,5 +171,29 @@ def run() -> int:
         return 1
 
 
+def run() -> int:
+    parser = build_parser()
+    args = parser.parse_args()
+
+    if not (args.profile or args.profile_json or args.cprofile):
+        return dispatch(parser, args)
+
+    # Instrumentation is opt-in: engines only record while a profiler is active
+    with profiling() as prof:
+        cprof = cProfile.Profile() if args.cprofile else None
+        if cprof is not None:
+            cprof.enable()
+        try:
+            return dispatch(parser, args)
+        finally:
+            if cprof is not None:
+                cprof.disable()
+                cprof.dump_stats(args.cprofile)
+            if args.profile:
+                prof.print_report()
+            if args.profile_json:
+                prof.to_json(args.profile_json)
+
+
 if __name__ == "__main__":
     raise SystemExit(run())